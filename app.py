@@ -1,223 +1,302 @@
-import pandas as pd
-import plotly.express as px
-import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
-
-try:
-    df_full = pd.read_csv('https://raw.githubusercontent.com/fdx120000/plot/refs/heads/main/Summer_olympic_Medals.csv')
-except FileNotFoundError:
-    print("Error: 'Summer_olympic_Medals.csv' not found. Make sure the file is in the same directory as the script.")
-    exit()
-except Exception as e:
-    print(f"Error loading CSV: {e}")
-    exit()
-
-expected_cols_from_user = ['Year', 'Host_country', 'Host_city', 'Country_Name', 'Country_Code', 'Gold', 'Silver', 'Bronze']
-missing_cols = [col for col in expected_cols_from_user if col not in df_full.columns]
-if missing_cols:
-    print(f"Error: The CSV file is missing the following expected columns: {', '.join(missing_cols)}")
-    print(f"Available columns are: {', '.join(df_full.columns)}")
-    exit()
-
-# Correct country name
-df_full['Country_Name'] = df_full['Country_Name'].replace('United States', 'United States of America')
-
-# Filter data for years
-df = df_full[(df_full['Year'] >= 1992) & (df_full['Year'] <= 2020)].copy()
-
-# Calculate Total_Medals
-df['Total_Medals'] = df['Gold'] + df['Silver'] + df['Bronze']
-
-# Prepare lists for dropdowns
-all_countries = sorted(df['Country_Name'].unique())
-medal_types = ['Gold', 'Silver', 'Bronze', 'Total_Medals']
-
-# Create year options using the exact column names Host_city and Host_country
-year_host_info = df[['Year', 'Host_city', 'Host_country']].drop_duplicates().sort_values('Year')
-year_options = [{'label': 'All Years (1992-2020)', 'value': 'All'}] + \
-               [{'label': f"{row['Year']} - {row['Host_city']}, {row['Host_country']}", 'value': row['Year']}
-                for index, row in year_host_info.iterrows()]
-
-
-#2 Initialize Dash App
-app = dash.Dash(__name__)
-server = app.server
-
-app.layout = html.Div([
-    html.H1("Olympic Medals Dashboard (1992-2020)", style={'textAlign': 'center', 'marginBottom': '30px'}),
-
-    # Filtros em duas colunas
-    html.Div([
-        html.Div([
-            html.Label("Select Olympic Year (for Bar Chart):"),
-            dcc.Dropdown(
-                id='year-dropdown',
-                options=year_options,
-                value='All'
-            ),
-            html.Br(),
-            html.Label("Select Country (for Pie Chart):"),
-            dcc.Dropdown(
-                id='country-dropdown',
-                options=[{'label': country, 'value': country} for country in all_countries],
-                value=all_countries[0] if all_countries else None
-            ),
-        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingRight': '2%'}),
-
-        html.Div([
-            html.Label("Select Medal Type (for all charts):"),
-            dcc.Dropdown(
-                id='medal-type-dropdown',
-                options=[{'label': medal.replace('_', ' '), 'value': medal} for medal in medal_types],
-                value='Total_Medals'
-            ),
-        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-    ], style={'width': '90%', 'margin': '0 auto'}),
-
-    html.Br(),
-    html.H2("Medals by Country", style={'textAlign': 'center'}),
-
-    # Primeira linha de gráficos
-    html.Div([
-        html.Div([
-            dcc.Graph(id='pie-chart')
-        ], style={'width': '48%', 'display': 'inline-block', 'paddingRight': '2%'}),
-
-        html.Div([
-            dcc.Graph(id='bar-chart')
-        ], style={'width': '48%', 'display': 'inline-block'}),
-    ], style={'width': '90%', 'margin': '0 auto'}),
-
-    html.Br(),
-    html.H2("Medals Over Time and World Map", style={'textAlign': 'center'}),
-
-    # Segunda linha de gráficos
-    html.Div([
-        html.Div([
-            dcc.Graph(id='area-chart')
-        ], style={'width': '100%', 'marginBottom': '30px'}),
-
-        html.Div([
-            dcc.Graph(id='map-chart')
-        ], style={'width': '100%'})
-    ], style={'width': '90%', 'margin': '0 auto'})
-])
-
-
-# --- 4. Define Callbacks ---
-
-# Callback for Pie Chart
-@app.callback(
-    Output('pie-chart', 'figure'),
-    [Input('country-dropdown', 'value')]
-)
-def update_pie_chart(selected_country):
-    if not selected_country:
-        # Return an empty figure or a message
-        fig = px.pie(title="Please select a country")
-        fig.update_layout(annotations=[dict(text='No country selected', showarrow=False)])
-        return fig
-
-
-    country_data = df[df['Country_Name'] == selected_country]
-    if country_data.empty:
-        fig = px.pie(title=f"No data for {selected_country} (1992-2020)")
-        fig.update_layout(annotations=[dict(text='No data available', showarrow=False)])
-        return fig
-
-
-    medal_sum = country_data[['Gold', 'Silver', 'Bronze']].sum()
-    medal_counts_df = pd.DataFrame({
-        'Medal_Type': ['Gold', 'Silver', 'Bronze'],
-        'Count': [medal_sum.get('Gold', 0), medal_sum.get('Silver', 0), medal_sum.get('Bronze', 0)]
-    })
-    
-
-    fig_pie = px.pie(medal_counts_df,
-                     names='Medal_Type',
-                     values='Count',
-                     title=f'Medal Distribution for {selected_country} (1992-2020)',
-                     color='Medal_Type',
-                     color_discrete_map={'Gold': 'gold', 'Silver': 'silver', 'Bronze': '#cd7f32'})
-    fig_pie.update_traces(textposition='inside', textinfo='percent+label+value')
-    return fig_pie
-
-# Callback for Map Chart
-@app.callback(
-    Output('map-chart', 'figure'),
-    [Input('medal-type-dropdown', 'value')]
-)
-def update_map_chart(selected_medal_type):
-    medal_col = selected_medal_type
-    map_data = df.groupby('Country_Name', as_index=False)[medal_col].sum()
-
-    fig_map = px.choropleth(map_data,
-                            locations='Country_Name',
-                            locationmode='country names',
-                            color=medal_col,
-                            hover_name='Country_Name',
-                            color_continuous_scale=px.colors.sequential.YlOrRd, # Example color scale
-                            title=f'Total {selected_medal_type.replace("_", " ")} by Country (1992-2020)')
-    return fig_map
-
-# Callback for Area Chart
-@app.callback(
-    Output('area-chart', 'figure'),
-    [Input('medal-type-dropdown', 'value')]
-)
-def update_area_chart(selected_medal_type):
-    medal_col = selected_medal_type
-
-    df_country_year_medals = df.groupby(['Country_Name', 'Year'], as_index=False)[medal_col].sum()
-    top_10_countries_overall = df.groupby('Country_Name')[medal_col].sum().nlargest(10).index
-    df_top_10 = df_country_year_medals[df_country_year_medals['Country_Name'].isin(top_10_countries_overall)]
-
-    fig_area = px.area(df_top_10,
-                       x="Year",
-                       y=medal_col,
-                       color="Country_Name",
-                       title=f'Top 10 Countries by {selected_medal_type.replace("_", " ")} (1992-2020)',
-                       labels={medal_col: selected_medal_type.replace("_", " ") + ' Won'})
-    fig_area.update_xaxes(type='category') # Treat years as discrete categories for area chart
-    return fig_area
-
-# Callback for Bar Chart
-@app.callback(
-    Output('bar-chart', 'figure'),
-    [Input('medal-type-dropdown', 'value'),
-     Input('year-dropdown', 'value')]
-)
-def update_bar_chart(selected_medal_type, selected_year_value):
-    medal_col = selected_medal_type
-    current_df_bar = df.copy()
-    
-    year_title_segment = "All Years (1992-2020)"
-    if selected_year_value != 'All':
-        current_df_bar = current_df_bar[current_df_bar['Year'] == selected_year_value]
-        year_label_info_obj = next((item for item in year_options if item['value'] == selected_year_value), None)
-        if year_label_info_obj:
-            year_title_segment = year_label_info_obj['label']
-        else:
-            year_title_segment = str(selected_year_value) # Fallback if label not found
-
-    df_grouped_bar = current_df_bar.groupby('Country_Name', as_index=False)[medal_col].sum()
-    df_grouped_bar = df_grouped_bar.nlargest(10, medal_col) 
-
-    bar_color_val = None 
-    if medal_col == 'Gold': bar_color_val = 'gold'
-    elif medal_col == 'Silver': bar_color_val = 'silver'
-    elif medal_col == 'Bronze': bar_color_val = '#cd7f32'
-
-
-    fig_bar = px.bar(df_grouped_bar,
-                     x='Country_Name',
-                     y=medal_col,
-                     title=f'Top 10 Countries by {selected_medal_type.replace("_", " ")} in {year_title_segment}',
-                     labels={'Country_Name': 'Country', medal_col: selected_medal_type.replace("_", " ")})
-    if bar_color_val:
-        fig_bar.update_traces(marker_color=bar_color_val)
-    return fig_bar
-
-if __name__ == '__main__':
-    app.run_server(debug=True)
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import gzip
+import os
+
+import dash
+from dash import dcc, html
+from dash.dependencies import Input, Output
+from flask import Response, abort
+
+# Serialize figures with orjson's C encoder instead of stdlib json; this is
+# the dominant cost for the choropleth/area payloads.
+pio.json.config.default_engine = 'orjson'
+
+try:
+    # The Parquet file is generated by build_data.py and shipped with the app,
+    # so startup never re-fetches or re-parses the CSV.
+    df_full = pd.read_parquet('Summer_olympic_Medals.parquet')
+except FileNotFoundError:
+    print("Error: 'Summer_olympic_Medals.parquet' not found. Run build_data.py to generate it.")
+    exit()
+except Exception as e:
+    print(f"Error loading Parquet: {e}")
+    exit()
+
+expected_cols_from_user = ['Year', 'Host_country', 'Host_city', 'Country_Name', 'Country_Code', 'Gold', 'Silver', 'Bronze']
+missing_cols = [col for col in expected_cols_from_user if col not in df_full.columns]
+if missing_cols:
+    print(f"Error: The dataset is missing the following expected columns: {', '.join(missing_cols)}")
+    print(f"Available columns are: {', '.join(df_full.columns)}")
+    exit()
+
+# Correct country name. Categorize first (categorical country names group on
+# integer codes instead of string hashes), then fix the label with
+# rename_categories: a constant-time relabel with no row scan.
+df_full['Country_Name'] = df_full['Country_Name'].astype('category')
+df_full['Country_Name'] = df_full['Country_Name'].cat.rename_categories({'United States': 'United States of America'})
+
+# Filter data for years
+df = df_full[(df_full['Year'] >= 1992) & (df_full['Year'] <= 2020)].copy()
+
+# Calculate Total_Medals with one NumPy reduction over the uint16 block,
+# avoiding the intermediate Series that chained + operators allocate
+df['Total_Medals'] = df[['Gold', 'Silver', 'Bronze']].to_numpy().sum(axis=1, dtype=np.uint16)
+
+# Precompute aggregates once at startup. The data is static, so callbacks can
+# slice these lookup tables instead of re-running groupby on every interaction.
+COUNTRY_SUM = df.groupby('Country_Name')[['Gold', 'Silver', 'Bronze', 'Total_Medals']].sum()
+COUNTRY_YEAR_SUM = df.groupby(['Country_Name', 'Year'], as_index=False)[['Gold', 'Silver', 'Bronze', 'Total_Medals']].sum()
+
+# Pre-split the bar-chart source per year so the callback does a dict lookup
+# instead of masking and copying rows on every click. 'All' reuses the
+# overall per-country totals.
+BAR_SOURCE = {year: group for year, group in COUNTRY_YEAR_SUM.groupby('Year', sort=False)}
+BAR_SOURCE['All'] = COUNTRY_SUM.reset_index()
+
+# The dropdowns expose a known, finite input space, so resolve the top-10
+# frame for every (year, medal) pair up front; the bar callback becomes a
+# single dict lookup with no branching.
+BAR_CACHE = {(year, medal): frame.nlargest(10, medal)
+             for year, frame in BAR_SOURCE.items()
+             for medal in ['Gold', 'Silver', 'Bronze', 'Total_Medals']}
+
+# Top-10 countries per medal type, resolved once and held as category codes:
+# the area chart's membership filter becomes an integer np.isin over the code
+# array instead of hashing one string per row.
+COUNTRY_YEAR_CODES = COUNTRY_YEAR_SUM['Country_Name'].cat.codes.to_numpy()
+TOP10_CODES = {medal: COUNTRY_YEAR_SUM['Country_Name'].cat.categories.get_indexer(
+                   COUNTRY_SUM[medal].nlargest(10).index)
+               for medal in ['Gold', 'Silver', 'Bronze', 'Total_Medals']}
+
+# Map-chart source frozen to plain NumPy arrays: one locations vector plus one
+# value column per medal type, so the callback allocates nothing per request.
+MAP_LOCATIONS = COUNTRY_SUM.index.astype(str).to_numpy()
+MAP_VALUES = {medal: COUNTRY_SUM[medal].to_numpy()
+              for medal in ['Gold', 'Silver', 'Bronze', 'Total_Medals']}
+
+# Per-country medal sums embedded in the page for the clientside pie chart.
+COUNTRY_MEDAL_SUMS = COUNTRY_SUM[['Gold', 'Silver', 'Bronze']].astype(int).to_dict(orient='index')
+
+# Prepare lists for dropdowns
+all_countries = sorted(df['Country_Name'].unique())
+medal_types = ['Gold', 'Silver', 'Bronze', 'Total_Medals']
+
+# Create year options using the exact column names Host_city and Host_country
+year_host_info = df[['Year', 'Host_city', 'Host_country']].drop_duplicates().sort_values('Year')
+year_options = [{'label': 'All Years (1992-2020)', 'value': 'All'}] + \
+               [{'label': f"{row['Year']} - {row['Host_city']}, {row['Host_country']}", 'value': row['Year']}
+                for index, row in year_host_info.iterrows()]
+YEAR_LABEL = {opt['value']: opt['label'] for opt in year_options}
+
+# Nothing below reads the host columns, so drop them to shrink the rows the
+# remaining scans touch
+df = df.drop(columns=['Host_city', 'Host_country'])
+
+
+#2 Initialize Dash App
+app = dash.Dash(__name__, compress=True)
+server = app.server
+
+app.layout = html.Div([
+    html.H1("Olympic Medals Dashboard (1992-2020)", style={'textAlign': 'center', 'marginBottom': '30px'}),
+
+    # Filtros em duas colunas
+    html.Div([
+        html.Div([
+            html.Label("Select Olympic Year (for Bar Chart):"),
+            dcc.Dropdown(
+                id='year-dropdown',
+                options=year_options,
+                value='All'
+            ),
+            html.Br(),
+            html.Label("Select Country (for Pie Chart):"),
+            dcc.Dropdown(
+                id='country-dropdown',
+                options=[{'label': country, 'value': country} for country in all_countries],
+                value=all_countries[0] if all_countries else None
+            ),
+        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingRight': '2%'}),
+
+        html.Div([
+            html.Label("Select Medal Type (for all charts):"),
+            dcc.Dropdown(
+                id='medal-type-dropdown',
+                options=[{'label': medal.replace('_', ' '), 'value': medal} for medal in medal_types],
+                value='Total_Medals'
+            ),
+        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+    ], style={'width': '90%', 'margin': '0 auto'}),
+
+    html.Br(),
+    html.H2("Medals by Country", style={'textAlign': 'center'}),
+
+    # Primeira linha de gráficos
+    html.Div([
+        html.Div([
+            dcc.Graph(id='pie-chart')
+        ], style={'width': '48%', 'display': 'inline-block', 'paddingRight': '2%'}),
+
+        html.Div([
+            dcc.Graph(id='bar-chart')
+        ], style={'width': '48%', 'display': 'inline-block'}),
+    ], style={'width': '90%', 'margin': '0 auto'}),
+
+    html.Br(),
+    html.H2("Medals Over Time and World Map", style={'textAlign': 'center'}),
+
+    # Segunda linha de gráficos
+    html.Div([
+        html.Div([
+            dcc.Graph(id='area-chart')
+        ], style={'width': '100%', 'marginBottom': '30px'}),
+
+        html.Div([
+            dcc.Graph(id='map-chart')
+        ], style={'width': '100%'})
+    ], style={'width': '90%', 'margin': '0 auto'}),
+
+    # Static per-country sums shipped once at page load for the clientside pie
+    dcc.Store(id='country-sums', data=COUNTRY_MEDAL_SUMS)
+])
+
+
+# --- 4. Define Callbacks ---
+
+# Figures are built with graph_objects on top of these prebuilt layout
+# fragments; go.Figure copies them, so each callback only fills in trace
+# arrays and a title instead of walking plotly.express's trace factory.
+MEDAL_COLORS = {'Gold': 'gold', 'Silver': 'silver', 'Bronze': '#cd7f32'}
+AREA_LAYOUT = {'xaxis': {'type': 'category', 'title': {'text': 'Year'}}}  # Treat years as discrete categories
+BAR_LAYOUT = {'xaxis': {'title': {'text': 'Country'}}}
+
+# Clientside callback for Pie Chart. The per-country sums live in the
+# country-sums store, so the browser builds the pie trace directly with no
+# HTTP round-trip or Python work per selection.
+app.clientside_callback(
+    """
+    function(selected_country, sums) {
+        if (!selected_country) {
+            return {data: [], layout: {title: {text: 'Please select a country'},
+                                       annotations: [{text: 'No country selected', showarrow: false}]}};
+        }
+        var s = sums[selected_country];
+        if (!s) {
+            return {data: [], layout: {title: {text: 'No data for ' + selected_country + ' (1992-2020)'},
+                                       annotations: [{text: 'No data available', showarrow: false}]}};
+        }
+        return {
+            data: [{type: 'pie',
+                    labels: ['Gold', 'Silver', 'Bronze'],
+                    values: [s.Gold, s.Silver, s.Bronze],
+                    marker: {colors: ['gold', 'silver', '#cd7f32']},
+                    textposition: 'inside',
+                    textinfo: 'percent+label+value'}],
+            layout: {title: {text: 'Medal Distribution for ' + selected_country + ' (1992-2020)'}}
+        };
+    }
+    """,
+    Output('pie-chart', 'figure'),
+    [Input('country-dropdown', 'value'), Input('country-sums', 'data')]
+)
+
+# Map and Area figures. Both depend only on the medal-type dropdown, so the
+# builder shares the per-country totals and every figure is built once below.
+def build_map_and_area_figures(selected_medal_type):
+    medal_col = selected_medal_type
+
+    medal_label = selected_medal_type.replace('_', ' ')
+    fig_map = go.Figure(
+        data=[go.Choropleth(locations=MAP_LOCATIONS,
+                            locationmode='country names',
+                            z=MAP_VALUES[medal_col],
+                            colorscale='YlOrRd', # Example color scale
+                            colorbar={'title': {'text': medal_label}})],
+        layout={'title': {'text': f'Total {medal_label} by Country (1992-2020)'}})
+
+    df_top_10 = COUNTRY_YEAR_SUM[np.isin(COUNTRY_YEAR_CODES, TOP10_CODES[medal_col])]
+
+    fig_area = go.Figure(layout=AREA_LAYOUT)
+    fig_area.update_layout(title={'text': f'Top 10 Countries by {medal_label} (1992-2020)'},
+                           yaxis={'title': {'text': medal_label + ' Won'}})
+    for country, group in df_top_10.groupby('Country_Name', sort=True):
+        fig_area.add_scatter(x=group['Year'], y=group[medal_col], name=str(country),
+                             mode='lines', stackgroup='one')
+    return fig_map, fig_area
+
+# Bar figure
+def build_bar_figure(selected_medal_type, selected_year_value):
+    medal_col = selected_medal_type
+
+    year_title_segment = YEAR_LABEL.get(selected_year_value, str(selected_year_value))
+    df_grouped_bar = BAR_CACHE[(selected_year_value, medal_col)]
+
+    medal_label = selected_medal_type.replace('_', ' ')
+    fig_bar = go.Figure(
+        data=[go.Bar(x=df_grouped_bar['Country_Name'].astype(str),
+                     y=df_grouped_bar[medal_col],
+                     marker_color=MEDAL_COLORS.get(medal_col))],
+        layout=BAR_LAYOUT)
+    fig_bar.update_layout(title={'text': f'Top 10 Countries by {medal_label} in {year_title_segment}'},
+                          yaxis={'title': {'text': medal_label}})
+    return fig_bar
+
+
+# --- 5. Pre-encode figures and serve them as static gzipped bytes ---
+
+# Every dropdown combination maps to a figure we can build ahead of time, so
+# encode each one to gzipped JSON once and serve the bytes from a plain Flask
+# route; a request costs the server one dict lookup, no re-serialization.
+FIGURE_BYTES = {}
+for _medal in medal_types:
+    _fig_map, _fig_area = build_map_and_area_figures(_medal)
+    # The map/area update has two outputs, so store them as a JSON array
+    FIGURE_BYTES[f'map-area-{_medal}'] = gzip.compress(
+        ('[' + _fig_map.to_json() + ',' + _fig_area.to_json() + ']').encode('utf-8'))
+for _year_value, _medal in BAR_CACHE:
+    _fig_bar = build_bar_figure(_medal, _year_value)
+    FIGURE_BYTES[f'bar-{_year_value}-{_medal}'] = gzip.compress(_fig_bar.to_json().encode('utf-8'))
+
+
+@server.route('/fig/<key>')
+def serve_figure(key):
+    payload = FIGURE_BYTES.get(key)
+    if payload is None:
+        abort(404)
+    return Response(payload, content_type='application/json',
+                    headers={'Content-Encoding': 'gzip'})
+
+
+# The graph callbacks run clientside: the browser fetches the pre-encoded
+# figure bytes (decompressed transparently via Content-Encoding) and assigns
+# the parsed JSON to the Graph, bypassing Dash's serializer entirely.
+app.clientside_callback(
+    """
+    function(selected_medal_type) {
+        return fetch('/fig/map-area-' + selected_medal_type)
+            .then(function(resp) { return resp.json(); });
+    }
+    """,
+    [Output('map-chart', 'figure'), Output('area-chart', 'figure')],
+    [Input('medal-type-dropdown', 'value')]
+)
+
+app.clientside_callback(
+    """
+    function(selected_medal_type, selected_year_value) {
+        return fetch('/fig/bar-' + selected_year_value + '-' + selected_medal_type)
+            .then(function(resp) { return resp.json(); });
+    }
+    """,
+    Output('bar-chart', 'figure'),
+    [Input('medal-type-dropdown', 'value'),
+     Input('year-dropdown', 'value')]
+)
+
+if __name__ == '__main__':
+    # Local development only; production serves app:server via gunicorn
+    # (see Procfile). Set DEV=1 to enable the reloader and debugger.
+    app.run(debug=bool(os.environ.get('DEV')))
@@ -0,0 +1,23 @@
+"""Build-time data prep: fetch the medals CSV and write it as Parquet.
+
+Run this once when the dataset changes and commit the generated
+Summer_olympic_Medals.parquet; app.py loads the Parquet file directly so
+cold starts never re-fetch or re-parse the CSV.
+"""
+import pandas as pd
+
+CSV_URL = 'https://raw.githubusercontent.com/fdx120000/plot/refs/heads/main/Summer_olympic_Medals.csv'
+PARQUET_PATH = 'Summer_olympic_Medals.parquet'
+
+
+def main():
+    df = pd.read_csv(CSV_URL)
+    # Downcast at build time so the shipped file already has the compact dtypes
+    for col in ['Gold', 'Silver', 'Bronze', 'Year']:
+        df[col] = df[col].astype('uint16')
+    df.to_parquet(PARQUET_PATH, compression='zstd')
+    print(f"Wrote {PARQUET_PATH} ({len(df)} rows)")
+
+
+if __name__ == '__main__':
+    main()